@@ -40,7 +40,7 @@ from watchdog.events import DirModifiedEvent, FileModifiedEvent, FileSystemEvent
 from watchdog.observers import Observer
 
 from pybrook.consumers.base import BaseStreamConsumer, GearsStreamConsumer
-from pybrook.consumers.worker import ConsumerConfig
+from pybrook.consumers.worker import ConsumerConfig, Worker
 from pybrook.models import PyBrook
 
 
@@ -84,13 +84,21 @@ def add_consumer_args(
     workers_config = {}
     for c in consumers:
         if not isinstance(c, GearsStreamConsumer):
-            consumer_config = ConsumerConfig()
+            consumer_config = ConsumerConfig.default_for(c)
+            is_async = Worker(c).is_async
             try:
                 parser.add_argument(
                     f'--{c.consumer_group_name}-workers',
                     type=int,
-                    help='(default: %(default)s)',  # noqa: WPS323
+                    help=('(default: %(default)s, see DEFAULT_ASYNC_WORKERS)'  # noqa: WPS323
+                          if is_async else '(default: %(default)s, see DEFAULT_WORKERS)'),  # noqa: WPS323
                     default=consumer_config.workers)
+                if is_async:
+                    parser.add_argument(
+                        f'--{c.consumer_group_name}-coroutines',
+                        type=int,
+                        help='(default: %(default)s, see ASYNC_MESSAGES_IN_FLIGHT)',  # noqa: WPS323
+                        default=consumer_config.coroutines)
             except argparse.ArgumentError:
                 ... # OK, this argument already exists
             workers_config[c.consumer_group_name] = consumer_config
@@ -110,9 +118,10 @@ def update_workers_config(args: argparse.Namespace,
 
     """
     for c in workers_config.keys():
-        for arg in ('workers', ):
+        for arg in ('workers', 'coroutines'):
             arg_name: str = c.replace('-', '_') + '_' + arg
-            setattr(workers_config[c], arg, getattr(args, arg_name))
+            if hasattr(args, arg_name):
+                setattr(workers_config[c], arg, getattr(args, arg_name))
 
 
 def main():
@@ -121,6 +130,11 @@ def main():
 
     Starts PyBrook workers.
 
+    Every consumer gets a `--<consumer group>-workers` option.
+    Consumers with only an async implementation, like field generators of `async def` artificial fields,
+    default to `DEFAULT_ASYNC_WORKERS` processes instead of `DEFAULT_WORKERS`,
+    and also get a `--<consumer group>-coroutines` option, derived from `ASYNC_MESSAGES_IN_FLIGHT` by default.
+
     Examples:
 
         ```bash
@@ -139,15 +153,15 @@ def main():
         options:
           -h, --help
           --location-report:dr-workers LOCATION_REPORT:DR_WORKERS
-                                (default: 4)
+                                (default: 4, see DEFAULT_WORKERS)
           --direction-report:dr-workers DIRECTION_REPORT:DR_WORKERS
-                                (default: 4)
+                                (default: 4, see DEFAULT_WORKERS)
           --brigade-report:dr-workers BRIGADE_REPORT:DR_WORKERS
-                                (default: 4)
+                                (default: 4, see DEFAULT_WORKERS)
           --direction:dr-workers DIRECTION:DR_WORKERS
-                                (default: 4)
+                                (default: 4, see DEFAULT_WORKERS)
           --direction:fg-workers DIRECTION:FG_WORKERS
-                                (default: 4)
+                                (default: 4, see DEFAULT_WORKERS)
 
         ```
     """
@@ -16,6 +16,8 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 
+from multiprocessing import cpu_count
+
 from starlette.config import Config
 
 config = Config()
@@ -29,10 +31,17 @@ ARTIFICIAL_NAMESPACE = config('ARTIFICIAL_NAMESPACE',
                               default='artificial')
 DEFAULT_WORKERS = config('DEFAULT_WORKERS', int, default=4)
 
-WEBSOCKET_XREAD_BLOCK = config('WEBSOCKET_XREAD_BLOCK', int, default=100)
+DEFAULT_ASYNC_WORKERS = config('DEFAULT_ASYNC_WORKERS',
+                               int,
+                               default=max(2,
+                                           cpu_count() // 4))
 
-WEBSOCKET_XREAD_COUNT = config('WEBSOCKET_XREAD_COUNT', int, default=1000)
+ASYNC_MESSAGES_IN_FLIGHT = config('ASYNC_MESSAGES_IN_FLIGHT', int, default=400)
+
+API_XADD_BATCH = config('API_XADD_BATCH', int, default=64)
 
-WEBSOCKET_WAIT_TIME = config('WEBSOCKET_WAIT_TIME', float, default=0.01)
+API_XADD_LINGER_MS = config('API_XADD_LINGER_MS', float, default=1)
 
-WEBSOCKET_PING_INTERVAL = config('WEBSOCKET_PING_INTERVAL', int, default=30)
+WEBSOCKET_XREAD_BLOCK = config('WEBSOCKET_XREAD_BLOCK', int, default=100)
+
+WEBSOCKET_XREAD_COUNT = config('WEBSOCKET_XREAD_COUNT', int, default=1000)
@@ -23,7 +23,7 @@ import signal
 import sys
 from concurrent import futures
 from enum import Enum
-from typing import Dict, Iterable, MutableMapping, Set, Tuple, Union
+from typing import Dict, Iterable, List, MutableMapping, Optional, Set, Tuple, Union
 
 import redis.asyncio as aioredis
 import redis
@@ -45,12 +45,14 @@ class BaseStreamConsumer:
                  consumer_group_name: str,
                  input_streams: Iterable[str],
                  use_thread_executor: bool = False,
+                 batch_writes: bool = True,
                  read_chunk_length: int = 1,
                  read_messages_since: Union[str, int] = '$'):
         self.consumer_group_name = consumer_group_name
         self.redis_url = redis_url
         self._active = False
         self._use_thread_executor = use_thread_executor
+        self._batch_writes = batch_writes
         self._read_chunk_length = read_chunk_length
         self.executor = None
         self.input_streams = tuple(input_streams)
@@ -63,6 +65,10 @@ class BaseStreamConsumer:
     def supported_impl(self) -> Set[ConsumerImpl]:
         return set()  # pragma: nocover
 
+    @property
+    def read_chunk_length(self) -> int:
+        return self._read_chunk_length
+
     def __repr__(self):
         return f'<{self.__class__.__name__} input_streams={self.input_streams}>'
 
@@ -78,15 +84,17 @@ class BaseStreamConsumer:
         redis_conn = redis.from_url(self.redis_url,
                                     encoding='utf-8',
                                     decode_responses=True)
-        for stream in self.input_streams:
-            try:
-                redis_conn.xgroup_create(stream,
-                                         self.consumer_group_name,
-                                         id=self.read_messages_since,
-                                         mkstream=True)
-            except redis.ResponseError as e:
-                if 'BUSYGROUP' not in str(e):
-                    raise e  # pragma: nocover
+        with redis_conn.pipeline(transaction=False) as p:
+            for stream in self.input_streams:
+                p.xgroup_create(stream,
+                                self.consumer_group_name,
+                                id=self.read_messages_since,
+                                mkstream=True)
+            results = p.execute(raise_on_error=False)
+        for result in results:
+            if isinstance(result, redis.ResponseError) and 'BUSYGROUP' not in str(result):
+                raise result  # pragma: nocover
+        redis_conn.close()
 
     def stop(self, signum=None, frame=None):
         if not self._active:
@@ -148,6 +156,7 @@ class SyncStreamConsumer(BaseStreamConsumer):
         redis_conn: redis.Redis = redis.from_url(self.redis_url,
                                                  encoding='utf-8',
                                                  decode_responses=True)
+        redis_conn.ping()  # Connect before the first message arrives
         self._active = True
         xreadgroup_params = self._xreadgroup_params
         if self._use_thread_executor:
@@ -157,6 +166,9 @@ class SyncStreamConsumer(BaseStreamConsumer):
         tasks: Set[futures.Future] = set()
         while self.active:
             response = redis_conn.xreadgroup(**xreadgroup_params)
+            if self._batch_writes and not self._use_thread_executor:
+                self._handle_batch_sync(response, redis_conn)
+                continue
             for stream, messages in response:
                 for msg_id, payload in messages:
                     if self._use_thread_executor:
@@ -178,16 +190,32 @@ class SyncStreamConsumer(BaseStreamConsumer):
                             break
         redis_conn.close()
 
+    def _handle_batch_sync(self, response: List, redis_conn: redis.Redis):
+        """Writes the results and acks of the whole XREADGROUP batch in a single transaction."""
+        if not response:
+            return
+        with redis_conn.pipeline() as p:
+            for stream, messages in response:
+                for msg_id, payload in messages:
+                    self._queue_message_sync(stream, msg_id, payload,
+                                             redis_conn, p)
+            p.execute()
+
+    def _queue_message_sync(self, stream: str, msg_id: str,
+                            payload: Dict[str, str], redis_conn: redis.Redis,
+                            pipeline: redis.client.Pipeline):
+        result = self.process_message_sync(stream,
+                                           payload,
+                                           redis_conn=redis_conn,
+                                           pipeline=pipeline)
+        for out_stream, out_msg in result.items():
+            pipeline.xadd(out_stream, out_msg)
+        pipeline.xack(stream, self.consumer_group_name, msg_id)
+
     def _handle_message_sync(self, stream: str, msg_id: str,
                              payload: Dict[str, str], redis_conn: redis.Redis):
         with redis_conn.pipeline() as p:
-            result = self.process_message_sync(stream,
-                                               payload,
-                                               redis_conn=redis_conn,
-                                               pipeline=p)
-            for out_stream, out_msg in result.items():
-                p.xadd(out_stream, out_msg)
-            p.xack(stream, self.consumer_group_name, msg_id)
+            self._queue_message_sync(stream, msg_id, payload, redis_conn, p)
             try:
                 p.execute()
             except redis.WatchError:  # pragma: nocover
@@ -214,10 +242,20 @@ class AsyncStreamConsumer(BaseStreamConsumer):
                 'Waiting for all asyncio tasks to finish, use Ctrl + C to force exit.'
             )
 
-    async def run_async(self):  # noqa: WPS231
-        self.register_signals()
-        redis_conn: aioredis.Redis = await aioredis.from_url(
-            self.redis_url, encoding='utf-8', decode_responses=True)
+    def connection_pool_async(self) -> aioredis.ConnectionPool:
+        return aioredis.ConnectionPool.from_url(self.redis_url,
+                                                encoding='utf-8',
+                                                decode_responses=True)
+
+    async def run_async(  # noqa: WPS231
+            self,
+            pool: Optional[aioredis.ConnectionPool] = None,
+            register_signals: bool = True):
+        if register_signals:
+            self.register_signals()
+        redis_conn: aioredis.Redis = await aioredis.Redis(
+            connection_pool=pool or self.connection_pool_async(),
+            auto_close_connection_pool=pool is None)
         self.active = True
         xreadgroup_params = self._xreadgroup_params
         tasks: Set[asyncio.Future] = set()
@@ -32,7 +32,7 @@
 
 import dataclasses
 from itertools import chain
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import redis
 
@@ -40,6 +40,17 @@ from pybrook.config import MSG_ID_FIELD, SPECIAL_CHAR
 from pybrook.consumers.base import SyncStreamConsumer
 from pybrook.encoding import decode_value, encode_value
 
+# KEYS: dependency map, dependency counter
+# ARGV: number of new dependencies, number of all dependencies, key1, value1, key2, value2...
+RESOLVE_SCRIPT = """
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+local num_resolved = redis.call('INCRBY', KEYS[2], ARGV[1])
+if num_resolved == tonumber(ARGV[2]) then
+    return redis.call('HGETALL', KEYS[1])
+end
+return false
+"""
+
 
 class DependencyResolver(SyncStreamConsumer):
     @dataclasses.dataclass
@@ -87,6 +98,9 @@ class DependencyResolver(SyncStreamConsumer):
         if not output_stream_name:
             output_stream_name = f'{SPECIAL_CHAR}{consumer_group_name}{SPECIAL_CHAR}deps'
         self.output_stream_name: str = output_stream_name
+        self._resolve_script: Optional[redis.commands.core.Script] = None
+        # Historical values are written through the pipeline, and the next message may already need them
+        kwargs.setdefault('batch_writes', not self._historical_dependencies)
         input_streams = list({
             s.src_stream  # type: ignore
             for s in chain(dependencies, self._historical_dependencies)
@@ -128,8 +142,7 @@ class DependencyResolver(SyncStreamConsumer):
             self, stream_name: str, message: Dict[str, str], *,
             redis_conn: redis.Redis,
             pipeline: redis.client.Pipeline) -> Dict[str, Dict[str, str]]:
-        message_id_enc = message.pop(MSG_ID_FIELD)
-        message_id = decode_value(message_id_enc)
+        message_id = message.pop(MSG_ID_FIELD)
         dep_key = self.dependency_map_key(message_id)
         incr_key = dep_key + f'{SPECIAL_CHAR}incr'
         new_deps = {
@@ -137,17 +150,26 @@ class DependencyResolver(SyncStreamConsumer):
             for k in self._dependencies
             if k.src_key in message
         }
-        incr_num = 0
+        dependencies = None
         if new_deps:
-            with redis_conn.pipeline() as p:
-                p.multi()
-                p.hset(dep_key, mapping=new_deps)  # type: ignore
-                p.incrby(incr_key, len(new_deps))
-                _, incr_num = p.execute()
+            if not self._resolve_script:
+                self._resolve_script = redis_conn.register_script(RESOLVE_SCRIPT)
+            # Stores the new dependencies and fetches all of them once complete, in a single round trip
+            resolved = self._resolve_script(
+                keys=[dep_key, incr_key],
+                args=[
+                    len(new_deps), self._num_dependencies,
+                    *chain.from_iterable(new_deps.items())
+                ],
+                client=redis_conn)
+            if resolved:
+                dependencies = dict(zip(resolved[::2], resolved[1::2]))
+        elif not self._num_dependencies:
+            # Without regular dependencies every message is complete, only the history is loaded
+            dependencies = redis_conn.hgetall(dep_key)
         if self._historical_dependencies:
             self.send_historical_deps(message_id, message, pipeline)
-        if incr_num == self._num_dependencies:
-            dependencies = redis_conn.hgetall(dep_key)
+        if dependencies is not None:
             for h in self._historical_dependencies:
                 dependencies[h.dst_key] = []
                 for i in range(h.history_length):
@@ -161,7 +183,7 @@ class DependencyResolver(SyncStreamConsumer):
             pipeline.delete(dep_key, incr_key)
             return {
                 self.output_stream_name: {
-                    MSG_ID_FIELD: message_id_enc,
+                    MSG_ID_FIELD: message_id,
                     **dependencies
                 }
             }
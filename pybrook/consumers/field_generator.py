@@ -65,8 +65,9 @@ class BaseFieldGenerator(BaseStreamConsumer):
             **pydantic_fields  # type: ignore
         )
 
+        # Threads only help generators that wait for Redis, pure functions are called inline.
+        kwargs.setdefault('use_thread_executor', bool(self.redis_deps))
         super().__init__(redis_url=redis_url,
-                         use_thread_executor=True,
                          consumer_group_name=f'{field_name}{SPECIAL_CHAR}fg',
                          input_streams=[dependency_stream],
                          read_chunk_length=read_chunk_length,
@@ -18,8 +18,9 @@
 
 import inspect
 import pickle  # noqa: S403
+from itertools import chain
 from textwrap import dedent
-from typing import Any, Callable, Dict, Iterable
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import redis.asyncio as aioredis
 import redis
@@ -32,7 +33,15 @@ from pybrook.consumers.base import (
     GearsStreamConsumer,
     SyncStreamConsumer,
 )
-from pybrook.encoding import decode_value, encode_value
+from pybrook.encoding import decode_value
+
+OBJ_MSG_ID_KEY_PREFIX = f'{SPECIAL_CHAR}id{SPECIAL_CHAR}'
+# KEYS: object message ID counter, output stream
+# ARGV: message ID field, message ID prefix, field1, value1, field2, value2...
+SPLIT_SCRIPT = """
+local obj_msg_id = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], '*', ARGV[1], ARGV[2] .. obj_msg_id, unpack(ARGV, 3))
+"""
 
 
 class BaseSplitter(BaseStreamConsumer):
@@ -47,24 +56,28 @@ class BaseSplitter(BaseStreamConsumer):
                  **kwargs):
         self.namespace: str = namespace
         self.object_id_field: str = object_id_field
+        self.output_stream_name: str = f'{SPECIAL_CHAR}{namespace}{SPECIAL_CHAR}split'
+        self._split_script_sync: Optional[redis.commands.core.Script] = None
+        self._split_script_async: Optional[redis.commands.core.AsyncScript] = None
         super().__init__(redis_url=redis_url,
                          consumer_group_name=consumer_group_name,
                          input_streams=input_streams,
                          read_chunk_length=read_chunk_length,
                          **kwargs)
 
-    def split_msg(self, message: Dict[str, str], *, obj_id: str,
-                  obj_msg_id: str):
-        message_id = f'{obj_id}{SPECIAL_CHAR}{obj_msg_id}'
-        return {
-            f'{SPECIAL_CHAR}{self.namespace}{SPECIAL_CHAR}split': {
-                MSG_ID_FIELD: encode_value(message_id),
-                **message
-            }
-        }
+    def split_script_params(
+            self, message: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """Keys and args for `SPLIT_SCRIPT`, which numbers and writes the message server-side."""
+        obj_id = decode_value(message[self.object_id_field])
+        keys = [self.get_obj_msg_id_key(obj_id), self.output_stream_name]
+        args = [
+            MSG_ID_FIELD, f'{obj_id}{SPECIAL_CHAR}',
+            *chain.from_iterable(message.items())
+        ]
+        return keys, args
 
     def get_obj_msg_id_key(self, obj_id: str):
-        return f'{SPECIAL_CHAR}id{SPECIAL_CHAR}{obj_id}'
+        return f'{OBJ_MSG_ID_KEY_PREFIX}{obj_id}'
 
 
 class AsyncSplitter(AsyncStreamConsumer, BaseSplitter):
@@ -72,9 +85,11 @@ class AsyncSplitter(AsyncStreamConsumer, BaseSplitter):
             self, stream_name: str, message: Dict[str, str], *,
             redis_conn: aioredis.Redis,
             pipeline: aioredis.client.Pipeline) -> Dict[str, Dict[str, str]]:
-        obj_id = decode_value(message[self.object_id_field])
-        obj_msg_id = await redis_conn.incr(self.get_obj_msg_id_key(obj_id))
-        return self.split_msg(message, obj_id=obj_id, obj_msg_id=obj_msg_id)
+        if not self._split_script_async:
+            self._split_script_async = redis_conn.register_script(SPLIT_SCRIPT)
+        keys, args = self.split_script_params(message)
+        await self._split_script_async(keys=keys, args=args, client=pipeline)
+        return {}
 
 
 class SyncSplitter(SyncStreamConsumer, BaseSplitter):
@@ -82,9 +97,11 @@ class SyncSplitter(SyncStreamConsumer, BaseSplitter):
             self, stream_name: str, message: Dict[str, str], *,
             redis_conn: redis.Redis,
             pipeline: redis.client.Pipeline) -> Dict[str, Dict[str, str]]:
-        obj_id = decode_value(message[self.object_id_field])
-        obj_msg_id = str(redis_conn.incr(self.get_obj_msg_id_key(obj_id)))
-        return self.split_msg(message, obj_id=obj_id, obj_msg_id=obj_msg_id)
+        if not self._split_script_sync:
+            self._split_script_sync = redis_conn.register_script(SPLIT_SCRIPT)
+        keys, args = self.split_script_params(message)
+        self._split_script_sync(keys=keys, args=args, client=pipeline)
+        return {}
 
 
 class GearsSplitter(GearsStreamConsumer, BaseSplitter):
@@ -93,13 +110,14 @@ class GearsSplitter(GearsStreamConsumer, BaseSplitter):
         import json
         from itertools import chain
 
+        out_stream = self.output_stream_name
+
         def process_message(msg):  # noqa: WPS430
             message = msg["value"]
             obj_id = json.loads(message[self.object_id_field])
-            msg_id_key = f'{SPECIAL_CHAR}id{SPECIAL_CHAR}{obj_id}'
+            msg_id_key = f'{OBJ_MSG_ID_KEY_PREFIX}{obj_id}'
             obj_msg_id = execute("INCR", msg_id_key)
-            out_stream = f'{SPECIAL_CHAR}{self.namespace}{SPECIAL_CHAR}split'
-            message[MSG_ID_FIELD] = f'"{obj_id}:{obj_msg_id}"'
+            message[MSG_ID_FIELD] = f'{obj_id}:{obj_msg_id}'
             execute("XADD", out_stream, '*', *chain(*message.items()))
 
         for s in self._input_streams:
@@ -120,7 +138,6 @@ class GearsSplitter(GearsStreamConsumer, BaseSplitter):
         cmd = f'import pickle\nfrom typing import *\n{registration_fun_code}\n' \
               f'locals().update(pickle.loads({context_dumps}))\n' \
               f'register_readers(self=type("{self.__class__.__name__}", (), ctx), execute=execute, gears_builder=GearsBuilder)'''
-        print(cmd)
         out = conn.execute_command('RG.PYEXECUTE', cmd)
         logger.info(f'Registered Redis Gears Reader: \n{cmd}\n{out}')
 
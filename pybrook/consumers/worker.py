@@ -20,13 +20,14 @@ import asyncio
 import dataclasses
 import multiprocessing
 import signal
-from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
+import redis.asyncio as aioredis
 import redis
 import uvloop
 from loguru import logger
 
-from pybrook.config import DEFAULT_WORKERS
+from pybrook.config import ASYNC_MESSAGES_IN_FLIGHT, DEFAULT_ASYNC_WORKERS, DEFAULT_WORKERS
 from pybrook.consumers.base import (
     AsyncStreamConsumer,
     BaseStreamConsumer,
@@ -35,17 +36,34 @@ from pybrook.consumers.base import (
 )
 
 DEFAULT_PROCESSES_NUM = multiprocessing.cpu_count()
+RG_REGISTRATION_LOCK = b'RG.REGISTERLOCK'
 
 
 class Worker:
     def __init__(self, consumer: BaseStreamConsumer):
         self._consumer = consumer
 
-    def run(self, *, processes_num: int = DEFAULT_PROCESSES_NUM):
+    @property
+    def is_async(self) -> bool:
+        """Sync implementation is preferred, async one is used only if there is no other choice."""
+        return not isinstance(self._consumer, SyncStreamConsumer) and isinstance(
+            self._consumer, AsyncStreamConsumer)
+
+    @property
+    def default_coroutines_num(self) -> int:
+        """Enough coroutines to keep `ASYNC_MESSAGES_IN_FLIGHT` messages in flight, `read_chunk_length` per coroutine."""
+        return max(1, ASYNC_MESSAGES_IN_FLIGHT // self._consumer.read_chunk_length)
+
+    def run(self,
+            *,
+            processes_num: int = DEFAULT_PROCESSES_NUM,
+            coroutines_num: Optional[int] = None):
         if isinstance(self._consumer, SyncStreamConsumer):
             return self._spawn_sync(processes_num=processes_num)
         elif isinstance(self._consumer, AsyncStreamConsumer):
-            return self._spawn_async(processes_num=processes_num)
+            return self._spawn_async(
+                processes_num=processes_num,
+                coroutines_num=coroutines_num or self.default_coroutines_num)
         raise NotImplementedError(self._consumer)
 
     def _spawn_sync(self,
@@ -54,22 +72,39 @@ class Worker:
             target=self._consumer.run_sync,  # type: ignore
             processes_num=processes_num)
 
-    def _async_wrapper(self):
+    async def _run_coroutines(self, coroutines_num: int):
+        pool = self._consumer.connection_pool_async()  # type: ignore
+        # Signal handlers are per process, so they are installed once instead of by every coroutine.
+        self._consumer.register_signals()
+        try:
+            # Open one connection per coroutine upfront, so the first messages don't wait for them.
+            redis_conn = aioredis.Redis(connection_pool=pool)
+            await asyncio.gather(*(redis_conn.ping()
+                                   for _ in range(coroutines_num)))
+            await asyncio.gather(*(
+                self._consumer.run_async(  # type: ignore
+                    pool=pool, register_signals=False)
+                for _ in range(coroutines_num)))
+        finally:
+            await pool.disconnect()
+
+    def _async_wrapper(self, coroutines_num: int):
         policy = uvloop.EventLoopPolicy()
         asyncio.set_event_loop_policy(policy)
         asyncio.set_event_loop(policy.new_event_loop())
         try:
             asyncio.get_event_loop().run_until_complete(
-                self._consumer.run_async())
+                self._run_coroutines(coroutines_num))
         except KeyboardInterrupt:
             ...
         except asyncio.CancelledError:
             ...  # This is fine, shouldn't break anything
 
-    def _spawn_async(self, *,
-                     processes_num: int) -> Iterable[multiprocessing.Process]:
+    def _spawn_async(self, *, processes_num: int,
+                     coroutines_num: int) -> Iterable[multiprocessing.Process]:
         return self._spawn(target=self._async_wrapper,
-                           processes_num=processes_num)
+                           processes_num=processes_num,
+                           args=(coroutines_num, ))
 
     def _spawn(
             self,
@@ -94,6 +129,19 @@ class Worker:
 @dataclasses.dataclass
 class ConsumerConfig:
     workers: int = DEFAULT_WORKERS
+    coroutines: Optional[int] = None
+
+    @classmethod
+    def default_for(cls, consumer: BaseStreamConsumer) -> 'ConsumerConfig':
+        """
+        Async consumers spend most of their time waiting for Redis,
+        so they run fewer processes with many coroutines each.
+        """
+        worker = Worker(consumer)
+        if worker.is_async:
+            return cls(workers=DEFAULT_ASYNC_WORKERS,
+                       coroutines=worker.default_coroutines_num)
+        return cls()
 
 
 class WorkerManager:
@@ -125,26 +173,14 @@ class WorkerManager:
     def run(self):
         if self.processes:
             raise RuntimeError('Already running!')
-        signal.signal(signal.SIGINT, lambda *args: self.terminate)
-        signal.signal(signal.SIGTERM, lambda *args: self.terminate)
+        signal.signal(signal.SIGINT, lambda *args: self.terminate())
+        signal.signal(signal.SIGTERM, lambda *args: self.terminate())
 
         self.spawn_workers()
 
-        for redis_url in self.redis_urls:
-            redis_conn = redis.from_url(redis_url,
-                                        decode_responses=True,
-                                        encoding='utf-8')
-            if self.gears_consumers:
-                self.acquire_gears_registration_lock(redis_conn)
-                ids = [
-                    r[1]
-                    for r in redis_conn.execute_command('RG.DUMPREGISTRATIONS')
-                ]
-                for i in ids:
-                    redis_conn.execute_command('RG.UNREGISTER', i)
-                for consumer in self.gears_consumers:
-                    consumer.register_builder(redis_conn)
-                redis_conn.delete('RG.REGISTERLOCK')
+        if self.gears_consumers:
+            for redis_url in self.redis_urls:
+                self.register_gears_consumers(redis_url)
         for proc in self.processes:
             try:
                 proc.join()
@@ -154,21 +190,36 @@ class WorkerManager:
 
     def spawn_workers(self):
         for c in self.regular_consumers:
-            consumer_config = self.config.get(c.consumer_group_name,
-                                              ConsumerConfig())
+            consumer_config = self.config.get(
+                c.consumer_group_name) or ConsumerConfig.default_for(c)
             logger.info(f'Spawning worker for {c}...')
             w = Worker(c)
-            procs = w.run(processes_num=consumer_config.workers)
+            procs = w.run(processes_num=consumer_config.workers,
+                          coroutines_num=consumer_config.coroutines)
             self.processes.extend(procs)
 
+    def register_gears_consumers(self, redis_url: str):
+        # Replies are only passed back to Redis, so they are not decoded.
+        redis_conn = redis.from_url(redis_url)
+        self.acquire_gears_registration_lock(redis_conn)
+        ids = [
+            r[1] for r in redis_conn.execute_command('RG.DUMPREGISTRATIONS')
+        ]
+        for i in ids:
+            redis_conn.execute_command('RG.UNREGISTER', i)
+        for consumer in self.gears_consumers:
+            consumer.register_builder(redis_conn)
+        redis_conn.delete(RG_REGISTRATION_LOCK)
+        redis_conn.close()
+
     def acquire_gears_registration_lock(self, redis_conn: redis.Redis):
         with redis_conn.pipeline() as p:
-            p.watch('RG.REGISTERLOCK')
-            if p.exists('RG.REGISTERLOCK'):
+            p.watch(RG_REGISTRATION_LOCK)
+            if p.exists(RG_REGISTRATION_LOCK):
                 raise RuntimeError(
                     'Try again later, RG registration is locked, possibly by another instance'
                 )
             p.multi()
-            p.set('RG.REGISTERLOCK', '1')
-            p.expire('RG.REGISTERLOCK', 5)
+            p.set(RG_REGISTRATION_LOCK, b'1')
+            p.expire(RG_REGISTRATION_LOCK, 5)
             p.execute(raise_on_error=True)
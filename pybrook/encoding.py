@@ -34,9 +34,15 @@ from typing import Any, Dict
 
 import orjson
 
+from pybrook.config import MSG_ID_FIELD
+
 
 def encode_stream_message(data: Dict[str, Any]):
-    return {k: encode_value(v) for k, v in data.items()}
+    return {
+        # MSG_ID_FIELD is internal and always holds a plain string, so it is stored as is.
+        k: v if k == MSG_ID_FIELD else encode_value(v)
+        for k, v in data.items()
+    }
 
 
 def encode_value(v: Any):
@@ -44,7 +50,11 @@ def encode_value(v: Any):
 
 
 def decode_stream_message(data: Dict[str, str]):
-    return {k: decode_value(v) for k, v in data.items()}
+    return {
+        # MSG_ID_FIELD is stored as a plain string, see encode_stream_message.
+        k: v if k == MSG_ID_FIELD else decode_value(v)
+        for k, v in data.items()
+    }
 
 
 def decode_value(v: Any):
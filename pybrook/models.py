@@ -36,31 +36,34 @@ It is the core of PyBrook.
 #
 
 import asyncio
+import contextlib
 import dataclasses
 import inspect
 import signal
+from functools import partial
 from itertools import chain
 from pathlib import Path
-from time import time
 from typing import (  # noqa: WPS235
     Any, AsyncIterator, Callable, Dict, Generic, List, Mapping, Optional,
-    Sequence, Type, TypeVar, Union, get_type_hints,
+    Sequence, Set, Tuple, Type, TypeVar, Union, get_type_hints,
 )
 
 import redis.asyncio as aioredis
 import fastapi
+import orjson
 import pydantic
 import redis
 from loguru import logger
+from pydantic.utils import lenient_issubclass
 from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 from websockets.exceptions import ConnectionClosedOK
 
 from pybrook.config import (
+    API_XADD_BATCH,
+    API_XADD_LINGER_MS,
     MSG_ID_FIELD,
     SPECIAL_CHAR,
-    WEBSOCKET_PING_INTERVAL,
-    WEBSOCKET_WAIT_TIME,
     WEBSOCKET_XREAD_BLOCK,
     WEBSOCKET_XREAD_COUNT,
 )
@@ -210,13 +213,12 @@ class Dependency(Registrable):
         return self.src_field.value_type
 
     def validate_source_field(self, src: DependencySource):
-        self.is_aioredis = type(src) == type and issubclass(  # noqa: WPS516
-            src, aioredis.Redis)
-        self.is_redis = type(src) == type and issubclass(  # noqa: WPS516
-            src, redis.Redis)
         if isinstance(src, SourceField):
             return src
-        elif not (self.is_aioredis or self.is_redis):
+        if isinstance(src, type):
+            self.is_aioredis = issubclass(src, aioredis.Redis)
+            self.is_redis = issubclass(src, redis.Redis)
+        if not (self.is_aioredis or self.is_redis):
             raise ValueError(
                 f'{src} is not an instance of SourceField or a Redis class')
 
@@ -338,10 +340,10 @@ class ReportField:
 class InReportOptions:
     id_field: str
     name: str
+    stream_name: str = dataclasses.field(init=False, repr=False)
 
-    @property
-    def stream_name(self):
-        return f'{SPECIAL_CHAR}{self.name}'
+    def __post_init__(self):
+        self.stream_name = f'{SPECIAL_CHAR}{self.name}'
 
 
 TOPT = TypeVar('TOPT')
@@ -375,6 +377,7 @@ class InReportMeta(OptionsMixin[InReportOptions],
                    pydantic.main.ModelMetaclass):
     pybrook_options: InReportOptions
     _input_fields: Dict[str, 'InputField']
+    _is_flat: bool
 
     def __new__(mcs, name, bases, namespace):  # noqa: N804
         """
@@ -386,12 +389,19 @@ class InReportMeta(OptionsMixin[InReportOptions],
         for prop_name, field in cls.__fields__.items():
             cls._input_fields[prop_name] = InputField(cls,
                                                       field)  # type: ignore
+        # Reports without nested models can skip the recursive .dict() conversion
+        cls._is_flat = not any(
+            field.sub_fields or lenient_issubclass(field.type_, pydantic.BaseModel)
+            for field in cls.__fields__.values())
         return cls
 
     def __getattr__(cls, item: str) -> SourceField:  # noqa: N805
         """This enables the `Model.field` syntax used for references in PyBrook models."""
-        if not item.startswith('_') and item in cls._input_fields:
-            return cls._input_fields[item]
+        if not item.startswith('_'):
+            # Reading __dict__ avoids a nested __getattr__ call while the class is being created
+            input_fields = cls.__dict__.get('_input_fields', {})
+            if item in input_fields:
+                return input_fields[item]
         return super().__getattribute__(item)  # noqa: WPS613
 
     def _validate_options(
@@ -422,25 +432,26 @@ class InReport(ConsumerGenerator,
 
     @classmethod
     def gen_routes(cls, api: 'PyBrookApi', redis_dep: aioredis.Redis):
+        """Reports are written through `api.report_writer`, so `redis_dep` is not used."""
         @api.fastapi.post(f'/{cls.pybrook_options.name}',
                           name=f'Add {cls.pybrook_options.name}')
         async def add_report(
                 report: cls = fastapi.Body(...),  # type: ignore
-                redis_conn: aioredis.Redis = redis_dep):
-            await redis_conn.xadd(
-                cls.pybrook_options.stream_name,
-                encode_stream_message(
-                    report.dict(by_alias=False))  # type: ignore
-            )
+                report_writer: ReportWriter = fastapi.Depends(
+                    api.report_writer_dependency)):
+            report_dict = report.__dict__ if cls._is_flat else report.dict(  # type: ignore
+                by_alias=False)
+            await report_writer.xadd(cls.pybrook_options.stream_name,
+                                     encode_stream_message(report_dict))
 
 
 @dataclasses.dataclass
 class OutReportOptions:
     name: str
+    stream_name: str = dataclasses.field(init=False, repr=False)
 
-    @property
-    def stream_name(self):
-        return f'{SPECIAL_CHAR}{self.name}'
+    def __post_init__(self):
+        self.stream_name = f'{SPECIAL_CHAR}{self.name}'
 
 
 class OutReportMeta(OptionsMixin[OutReportOptions], type):
@@ -454,11 +465,18 @@ class OutReportMeta(OptionsMixin[OutReportOptions], type):
         and initializing the [pydantic_model][pybrook.models.OutReportMeta.pydantic_model] property.
         """
         cls = super().__new__(mcs, name, bases, namespace)  # noqa: WPS117
+        report_fields: Dict[str, ReportField] = {}
+        for klass in reversed(cls.__mro__):  # Later classes in the MRO are shadowed by earlier ones
+            for attr_name, attr_value in vars(klass).items():
+                if isinstance(attr_value, ReportField):
+                    report_fields[attr_name] = attr_value
+                else:
+                    report_fields.pop(attr_name, None)
         cls._report_fields = {}
-        for prop_name, report_field in inspect.getmembers(cls):
-            if isinstance(report_field, ReportField):
-                report_field.set_context(cls, prop_name)
-                cls._report_fields[prop_name] = report_field
+        for prop_name in sorted(report_fields):  # Same order as in dir()
+            report_field = report_fields[prop_name]
+            report_field.set_context(cls, prop_name)
+            cls._report_fields[prop_name] = report_field
         pydantic_fields = {
             rep_field.destination_field_name:
             (rep_field.source_field.value_type, pydantic.Field())
@@ -485,22 +503,6 @@ class OutReportMeta(OptionsMixin[OutReportOptions], type):
         """
         A Pydantic model describing the output report.
         """
-        pydantic_fields = {
-            report_field.destination_field_name:
-            (report_field.source_field.value_type, pydantic.Field())
-            for report_field in cls._report_fields.values()  # type: ignore
-        }
-        pydantic_fields[MSG_ID_FIELD] = (
-            str,
-            pydantic.Field(
-                title='Message ID',
-                description=(f'Message id - {{object ID}}'
-                             f'{SPECIAL_CHAR}{{msg index for object}}')))
-        if not hasattr(cls, '_model'):
-            cls._model: Type[pydantic.BaseModel] = pydantic.create_model(
-                cls.__name__ + 'Model',
-                **pydantic_fields  # type: ignore
-            )
         return cls._model
 
     def _validate_options(cls, options: OutReportOptions) -> OutReportOptions:
@@ -521,7 +523,8 @@ class OutReport(ConsumerGenerator, RouteGenerator, metaclass=OutReportMeta):
             messages = await redis_conn.xrevrange(
                 cls.pybrook_options.stream_name, count=1)
             for _msg_id, msg_body in messages:  # noqa: WPS328
-                return model_cls(**decode_stream_message(msg_body))
+                # FastAPI validates the response against response_model anyway
+                return model_cls.construct(**decode_stream_message(msg_body))
             return {}
 
         @api.fastapi.websocket(f'/{cls.pybrook_options.name}')
@@ -529,37 +532,48 @@ class OutReport(ConsumerGenerator, RouteGenerator, metaclass=OutReportMeta):
                 websocket: fastapi.WebSocket,
                 redis_conn: aioredis.Redis = redis_dep):
             await websocket.accept()
-            last_msg = '$'
             stream_name = cls.pybrook_options.stream_name
+            xread_streams = {stream_name: '$'}  # Reused, only the last message ID changes
             active = True
-            last_ping = time()
-            while active and api.fastapi.state.socket_active:
-                if time() - last_ping > WEBSOCKET_PING_INTERVAL:
-                    try:
-                        # Check if connection is active
-                        await asyncio.wait_for(websocket.receive_bytes(),
-                                               timeout=WEBSOCKET_WAIT_TIME)
-                    except asyncio.TimeoutError:
-                        ...  # Everything is OK
-                    except (fastapi.WebSocketDisconnect, AssertionError):
-                        active = False
-                    else:
-                        last_ping = time()
-                messages = await redis_conn.xread({stream_name: last_msg},
+
+            async def watch_disconnect():
+                # Clients are not expected to send anything, we only wait for them to leave
+                while True:
+                    ws_message = await websocket.receive()
+                    if ws_message['type'] == 'websocket.disconnect':
+                        return
+
+            def order_report_fields(report: Dict[str, Any]) -> Dict[str, Any]:
+                ordered = {k: report.pop(k) for k in model_cls.__fields__ if k in report}
+                ordered.update(report)  # Extra stream fields go last
+                return ordered
+
+            disconnect_watcher = asyncio.create_task(watch_disconnect())
+            while active and not disconnect_watcher.done(
+            ) and api.fastapi.state.socket_active:
+                messages = await redis_conn.xread(xread_streams,
                                                   count=WEBSOCKET_XREAD_COUNT,
                                                   block=WEBSOCKET_XREAD_BLOCK)
                 if messages:
-                    # Wiadomości w strumieniach są mapami
-                    for m_data in dict(messages)[stream_name]:
-                        last_msg, payload = m_data
+                    # Only one stream is read, so it is always the first entry
+                    batch = messages[0][1]
+                    xread_streams[stream_name] = batch[-1][0]
+                    # Reports were validated when they were produced, so they are passed through as is,
+                    # only reordered to follow the model fields, like construct() did
+                    texts = [
+                        orjson.dumps(order_report_fields(decode_stream_message(payload))).decode()
+                        for _msg_id, payload in batch
+                    ]
+                    for text in texts:
                         try:
-                            await websocket.send_text(
-                                model_cls(
-                                    **decode_stream_message(payload)).json())
-                        except ConnectionClosedOK:
-                            active = False
-                        except RuntimeError:
+                            await websocket.send_text(text)
+                        except (ConnectionClosedOK, RuntimeError):
                             active = False
+                            break
+            disconnect_watcher.cancel()
+            # Retrieve the watcher's result, receive() raises RuntimeError once the socket is gone
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await disconnect_watcher
             try:
                 await websocket.close()
             except RuntimeError:
@@ -570,7 +584,7 @@ class OutReport(ConsumerGenerator, RouteGenerator, metaclass=OutReportMeta):
         api.schema.streams.append(
             StreamInfo(stream_name=cls.pybrook_options.stream_name,
                        websocket_path=f'/{cls.pybrook_options.name}',
-                       report_schema=cls.pydantic_model.schema()))
+                       report_schema=model_cls.schema()))
 
     @classmethod
     def gen_consumers(cls, model: 'PyBrook'):
@@ -598,7 +612,9 @@ class InputField(SourceField):
 
 class ArtificialField(SourceField, Registrable, ConsumerGenerator):
     def __init__(self, calculate: Callable, name: str = None):
-        annotations = get_type_hints(calculate)
+        annotations = dict(getattr(calculate, '__annotations__', {}))
+        if any(isinstance(a, str) for a in annotations.values()):
+            annotations = get_type_hints(calculate)  # Forward references need to be evaluated
         try:
             value_type = annotations.pop('return')
         except KeyError:
@@ -618,6 +634,16 @@ class ArtificialField(SourceField, Registrable, ConsumerGenerator):
             raise RuntimeError(
                 f'Artificial field "{self.field_name}" has default values'
                 f' which do not subclass Dependency.')
+        self._regular_dependencies: Dict[str, Dependency] = {
+            k: d
+            for k, d in self.dependencies.items()
+            if not isinstance(d, HistoricalDependency)
+        }
+        self._historical_dependencies: Dict[str, HistoricalDependency] = {
+            k: d  # type: ignore
+            for k, d in self.dependencies.items()
+            if isinstance(d, HistoricalDependency)
+        }
         self.calculate = calculate
 
     def __call__(self, *args, **kwargs):
@@ -625,19 +651,11 @@ class ArtificialField(SourceField, Registrable, ConsumerGenerator):
 
     @property
     def regular_dependencies(self) -> Dict[str, Dependency]:
-        return {
-            k: d
-            for k, d in self.dependencies.items()
-            if not isinstance(d, HistoricalDependency)
-        }
+        return self._regular_dependencies
 
     @property
     def historical_dependencies(self) -> Dict[str, HistoricalDependency]:
-        return {
-            k: d
-            for k, d in self.dependencies.items()
-            if isinstance(d, HistoricalDependency)
-        }
+        return self._historical_dependencies
 
     def on_registered(self, model: 'PyBrook'):
         for dep in self.dependencies.values():
@@ -695,6 +713,82 @@ TI = TypeVar('TI', bound=Type[InReport])
 TO = TypeVar('TO', bound=Type[OutReport])
 
 
+class ReportWriter:
+    """
+    Writes reports added through the API to Redis.
+
+    Reports from concurrent requests are buffered for up to `linger_ms`
+    and sent in a single pipeline, so they share one round trip.
+    """
+    def __init__(self,
+                 redis_conn: aioredis.Redis,
+                 *,
+                 batch_size: int = API_XADD_BATCH,
+                 linger_ms: float = API_XADD_LINGER_MS):
+        self.redis_conn = redis_conn
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._writes: Set[asyncio.Task] = set()
+
+    async def xadd(self, stream_name: str, message: Dict[str, Any]) -> str:
+        """
+        Adds the message to the stream.
+
+        Returns:
+            ID of the added message, once the batch containing it is written.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((stream_name, message, future))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif not self._flush_handle:
+            self._flush_handle = loop.call_later(self.linger, self.flush)
+        return await future
+
+    async def close(self):
+        """Sends all buffered messages and waits until they are written."""
+        self.flush()
+        await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def flush(self):
+        """Sends all buffered messages."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            write = asyncio.create_task(self._write(batch))
+            self._writes.add(write)
+            write.add_done_callback(partial(self._write_done, batch))
+
+    def _write_done(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]],
+                    write: asyncio.Task):
+        self._writes.discard(write)
+        # Futures are left pending only if the write was cancelled, requests waiting for them must not hang
+        for *_msg, future in batch:
+            future.cancel()
+
+    async def _write(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]):
+        try:
+            async with self.redis_conn.pipeline(transaction=False) as p:
+                for stream_name, message, _future in batch:
+                    p.xadd(stream_name, message)
+                # Errors are returned per command, so one bad report doesn't fail the whole batch
+                results = await p.execute(raise_on_error=False)
+        except Exception as e:
+            results = [e] * len(batch)
+        for (*_msg, future), result in zip(batch, results):  # noqa: WPS440
+            if future.done():  # The request could have been cancelled
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 class PyBrookApi:
     """
     Represents the HTTP API.
@@ -705,6 +799,8 @@ class PyBrookApi:
         self.fastapi = fastapi.FastAPI()
         self.brook = brook
         self.schema = PyBrookSchema()
+        self.report_writer: Optional[ReportWriter] = None
+        self._shutdown_task: Optional[asyncio.Task] = None
         self.fastapi.add_middleware(CORSMiddleware,
                                     allow_credentials=True,
                                     allow_origins=['*'],
@@ -723,17 +819,34 @@ class PyBrookApi:
                                name='static')
             self.fastapi.state.redis = await aioredis.from_url(
                 self.brook.redis_url, encoding='utf-8', decode_responses=True)
+            self.report_writer = ReportWriter(self.fastapi.state.redis)
+            self._shutdown_task = None
             self.fastapi.state.socket_active = True
-            signal.signal(signal.SIGINT, shutdown)
-            signal.signal(signal.SIGTERM, shutdown)
+            signal.signal(signal.SIGINT, on_signal)
+            signal.signal(signal.SIGTERM, on_signal)
 
-        @self.fastapi.on_event('shutdown')
-        def shutdown(*args):
+        async def close():
             logger.info('set socket active to false')
             self.fastapi.state.socket_active = False
-            asyncio.create_task(self.fastapi.state.redis.close())  # noqa: WPS219
-            asyncio.create_task(self.fastapi.state.redis.connection_pool.  # noqa: WPS219
-                                disconnect())
+            if self.report_writer:
+                # Buffered reports have to be written before the connection is closed
+                await self.report_writer.close()
+                self.report_writer = None
+            await self.fastapi.state.redis.close()  # noqa: WPS219
+            await self.fastapi.state.redis.connection_pool.disconnect()  # noqa: WPS219
+
+        def start_shutdown() -> asyncio.Task:
+            # Both a signal and the shutdown event can trigger it, but it runs only once
+            if not self._shutdown_task:
+                self._shutdown_task = asyncio.create_task(close())
+            return self._shutdown_task
+
+        @self.fastapi.on_event('shutdown')
+        async def shutdown():
+            await start_shutdown()
+
+        def on_signal(*args):
+            start_shutdown()
 
     async def redis_dependency(self) -> AsyncIterator[aioredis.Redis]:
         """
@@ -744,6 +857,20 @@ class PyBrookApi:
         """
         yield self.fastapi.state.redis
 
+    async def report_writer_dependency(self) -> AsyncIterator[ReportWriter]:
+        """
+        Report writer FastAPI Dependency
+
+        Yields:
+            The report writer, created on startup
+
+        Raises:
+            RuntimeError: When the API is not running.
+        """
+        if not self.report_writer:
+            raise RuntimeError('The report writer exists only between startup and shutdown, the API is not running.')
+        yield self.report_writer
+
     def visit(self, generator: RouteGenerator):
         """Visits a route generator to add new endpoints."""
         generator.gen_routes(self,
@@ -779,7 +906,10 @@ class PyBrook:
 
     @property
     def app(self) -> fastapi.FastAPI:
-        self.process_model()
+        """
+        The FastAPI app. Routes are added when reports are registered,
+        consumers are only generated by [run()][pybrook.models.PyBrook.run].
+        """
         return self.api.fastapi
 
     def run(self, config: Dict[str, ConsumerConfig] = None, enable_gears: bool = False):
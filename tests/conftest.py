@@ -37,6 +37,7 @@ import threading
 import redis.asyncio as aioredis
 import pytest
 import redis
+import uvloop
 
 from pybrook.consumers.base import BaseStreamConsumer
 from pybrook.consumers.worker import WorkerManager
@@ -48,7 +49,17 @@ def mock_processes(monkeypatch):
     monkeypatch.setattr(signal, 'signal', lambda *args, **kwargs: None)
 
 
+@pytest.fixture
+def event_loop():
+    """Runs async tests on uvloop, like the workers do."""
+    loop = uvloop.new_event_loop()
+    yield loop
+    loop.close()
+
+
 TEST_REDIS_URI = 'redis://localhost/'
+TEST_REDIS_POOL = redis.ConnectionPool.from_url(TEST_REDIS_URI,
+                                                decode_responses=True)
 
 
 @pytest.fixture
@@ -65,8 +76,7 @@ async def redis_async():
 
 @pytest.fixture
 def redis_sync():
-    redis_sync: redis.Redis = redis.from_url(TEST_REDIS_URI,
-                                             decode_responses=True)
+    redis_sync: redis.Redis = redis.Redis(connection_pool=TEST_REDIS_POOL)
     redis_sync.flushdb()
     yield redis_sync
     redis_sync.close()
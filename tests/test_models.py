@@ -29,12 +29,16 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
+import asyncio
 import time
 from threading import Thread
 
 import pytest
+import redis
 from starlette.testclient import TestClient
 
+from pybrook.config import MSG_ID_FIELD
+from pybrook.models import InReport, OutReport, PyBrook, ReportField, ReportWriter
 from tests.conftest import TEST_REDIS_URI
 
 
@@ -76,3 +80,71 @@ def test_example(get_brook, limit_time, redis_sync, mock_processes):
         assert redis_sync.xlen(':location-report') == 2
     finally:
         t.join()
+
+
+@pytest.mark.asyncio
+async def test_report_writer(redis_async):
+    writer = ReportWriter(redis_async, batch_size=10, linger_ms=1)
+    await redis_async.set('not-a-stream', 1)
+    results = await asyncio.gather(
+        *(writer.xadd('reports', {'i': i}) for i in range(25)),
+        writer.xadd('not-a-stream', {'i': 0}),
+        return_exceptions=True)
+    assert isinstance(results.pop(), redis.ResponseError)
+    # Batches are written concurrently, so only the IDs are compared, not their order
+    assert sorted(m for m, _ in await redis_async.xrange('reports')) == sorted(results)
+
+
+@pytest.mark.asyncio
+async def test_report_writer_close(redis_async):
+    writer = ReportWriter(redis_async, batch_size=10, linger_ms=60000)
+    task = asyncio.create_task(writer.xadd('reports', {'i': 0}))
+    await asyncio.sleep(0)
+    await writer.close()
+    assert [m for m, _ in await redis_async.xrange('reports')] == [await task]
+
+
+def test_add_report_before_startup():
+    brook = PyBrook(TEST_REDIS_URI)
+
+    @brook.input('test-report', id_field='test_id')
+    class TestReport(InReport):
+        test_id: int
+
+    with pytest.raises(RuntimeError, match='not running'):
+        TestClient(app=brook.app).post('/test-report', json={'test_id': 1})
+
+
+@pytest.mark.asyncio
+async def test_report_writer_cancelled(redis_async):
+    writer = ReportWriter(redis_async, batch_size=1)
+    task = asyncio.create_task(writer.xadd('reports', {'i': 0}))
+    await asyncio.sleep(0)
+    for write in writer._writes:  # noqa: WPS437
+        write.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, 1)
+
+
+def test_out_report_fields_from_bases():
+    brook = PyBrook(TEST_REDIS_URI)
+
+    @brook.input('test-report', id_field='test_id')
+    class TestReport(InReport):
+        test_id: int
+        a: int
+        b: str
+
+    class IdMixin:
+        test_id = ReportField(TestReport.test_id)
+
+    class BaseOutReport(OutReport):
+        a = ReportField(TestReport.a)
+        b = ReportField(TestReport.b)
+
+    class TestOutReport(IdMixin, BaseOutReport):
+        b = None
+
+    assert set(TestOutReport.pydantic_model.__fields__) == {
+        'test_id', 'a', MSG_ID_FIELD
+    }
@@ -30,12 +30,13 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 
+import argparse
 import asyncio
 import multiprocessing
 import random
 import signal
-import threading
-from time import sleep
+from concurrent import futures
+from time import monotonic, sleep
 from typing import Dict, List
 
 import redis.asyncio as aioredis
@@ -43,24 +44,34 @@ import pytest
 import redis
 from loguru import logger
 
-from pybrook.config import MSG_ID_FIELD
+from pybrook.__main__ import add_consumer_args, update_workers_config
+from pybrook.config import (
+    ASYNC_MESSAGES_IN_FLIGHT,
+    DEFAULT_ASYNC_WORKERS,
+    DEFAULT_WORKERS,
+    MSG_ID_FIELD,
+)
 from pybrook.consumers.base import AsyncStreamConsumer, ConsumerImpl, SyncStreamConsumer
 from pybrook.consumers.dependency_resolver import DependencyResolver
 from pybrook.consumers.splitter import AsyncSplitter, Splitter, SyncSplitter
-from pybrook.consumers.worker import Worker
-from pybrook.encoding import decode_value
+from pybrook.consumers.worker import ConsumerConfig, Worker
 from tests.conftest import TEST_REDIS_URI
 
+WRITE_CHUNK_LENGTH = 10000
+
 
 def write_test_reports(redis_sync: redis.Redis,
                        num: int) -> List[Dict[str, str]]:
     """Generates input reports for testing."""
     data = []
-    with redis_sync.pipeline() as p:
+    with redis_sync.pipeline(transaction=False) as p:
+        xadd = p.xadd
         for i in range(num):
             item = {'vehicle_id': '"Vehicle 1"', 'a': f'{i}', 'b': f'{i + 1}'}
-            p.xadd('test_input', item)
+            xadd('test_input', item)
             data.append(item)
+            if len(p) == WRITE_CHUNK_LENGTH:
+                p.execute()
         p.execute()
     return data
 
@@ -77,16 +88,16 @@ def test_input(redis_sync) -> List[Dict[str, str]]:
 
 @pytest.fixture()
 def test_dependency(redis_sync) -> List[Dict[str, str]]:
-    with redis_sync.pipeline() as p:
+    with redis_sync.pipeline(transaction=False) as p:
         for i in range(100):
-            p.xadd(':a', {':_msg_id': f'"Vehicle 1:{i}"', 'a': str(i)})
-            p.xadd(':b', {':_msg_id': f'"Vehicle 1:{i}"', 'b': str(i)})
+            p.xadd(':a', {':_msg_id': f'Vehicle 1:{i}', 'a': str(i)})
+            p.xadd(':b', {':_msg_id': f'Vehicle 1:{i}', 'b': str(i)})
         p.execute()
 
 
 @pytest.mark.parametrize('mode', ('sync', 'async'))
 def test_worker(test_input, redis_sync, mode, limit_time, mock_processes):
-    messages = multiprocessing.Manager().list()
+    messages_queue = multiprocessing.SimpleQueue()
     random.seed(16)
 
     class TestConsumer(SyncStreamConsumer, AsyncStreamConsumer):
@@ -96,7 +107,7 @@ def test_worker(test_input, redis_sync, mode, limit_time, mock_processes):
                 pipeline: redis.client.Pipeline) -> Dict[str, Dict[str, str]]:
             # simulate out of order execution
             sleep(random.choice([0, 0.5]))
-            messages.append(message)
+            messages_queue.put(message)
             return {}
 
         async def process_message_async(
@@ -105,7 +116,7 @@ def test_worker(test_input, redis_sync, mode, limit_time, mock_processes):
         ) -> Dict[str, Dict[str, str]]:
             # simulate out of order execution
             await asyncio.sleep(random.choice([0, 0.5]))
-            messages.append(message)
+            messages_queue.put(message)
             return {}
 
     worker = Worker(
@@ -118,6 +129,9 @@ def test_worker(test_input, redis_sync, mode, limit_time, mock_processes):
 
     for p in processes:
         p.join()
+    messages = []
+    while not messages_queue.empty():
+        messages.append(messages_queue.get())
     messages = sorted(messages, key=lambda o: o['a'])
     assert messages == test_input
 
@@ -132,19 +146,14 @@ async def test_splitter_async(redis_async: aioredis.Redis, test_input,
                              redis_url=TEST_REDIS_URI,
                              input_streams=['test_input'])
     splitter.register_consumer()
-    tasks = []
-    for _ in range(8):
-        task = asyncio.create_task(splitter.run_async())
-        tasks.append(task)
-
-    await asyncio.wait(tasks)
+    await asyncio.gather(*(splitter.run_async() for _ in range(8)))
     message = (await redis_async.xread(streams={':test:split': '0-0'},
                                        count=1))[0]
 
     assert (await redis_async.xlen(':test:split')) == len(test_input)
     assert message[0] == ':test:split'
     assert message[1][0][1] == {
-        ':_msg_id': '"Vehicle 1:1"',
+        ':_msg_id': 'Vehicle 1:1',
         'a': '0',
         'b': '1',
         'vehicle_id': '"Vehicle 1"'
@@ -161,19 +170,15 @@ def test_splitter_sync(redis_sync: redis.Redis, test_input, limit_time,
                             input_streams=['test_input'])
     splitter.register_consumer()
 
-    ps = []
-    for i in range(16):
-        proc = threading.Thread(target=splitter.run_sync)
-        proc.start()
-        ps.append(proc)
-    for p in ps:
-        p.join()
+    with futures.ThreadPoolExecutor(max_workers=16) as executor:
+        for task in [executor.submit(splitter.run_sync) for _ in range(16)]:
+            task.result()
 
     assert redis_sync.xlen(':test:split') == len(test_input)
     message = redis_sync.xread(streams={':test:split': '0-0'}, count=1)[0]
     assert message[0] == ':test:split'
     assert message[1][0][1] == {
-        ':_msg_id': '"Vehicle 1:1"',
+        ':_msg_id': 'Vehicle 1:1',
         'a': '0',
         'b': '1',
         'vehicle_id': '"Vehicle 1"'
@@ -194,20 +199,39 @@ def test_dependency_resolver_sync(redis_sync: redis.Redis, test_dependency,
                                   read_messages_since=0,
                                   redis_url=TEST_REDIS_URI)
     resolver.register_consumer()
-    ps = []
-    for i in range(16):
-        proc = threading.Thread(target=resolver.run_sync)
-        ps.append(proc)
-        proc.start()
-
-    for p in ps:
-        p.join()
+    with futures.ThreadPoolExecutor(max_workers=16) as executor:
+        for task in [executor.submit(resolver.run_sync) for _ in range(16)]:
+            task.result()
 
     assert redis_sync.xlen(resolver.output_stream_name) == 100
     out_data = redis_sync.xread({resolver.output_stream_name: '0'})[0][1]
     for _, message in out_data:
-        assert decode_value(message[MSG_ID_FIELD]).split(
-            ':')[-1] == message['a'] == message['b']
+        assert message[MSG_ID_FIELD].split(':')[-1] == message['a'] == message['b']
+
+
+def test_dependency_resolver_historical_only(redis_sync: redis.Redis,
+                                             test_dependency, limit_time,
+                                             mock_processes):
+    resolver = DependencyResolver(
+        resolver_name='prev_resolver',
+        dependencies=[],
+        historical_dependencies=[
+            DependencyResolver.HistoricalDep(src_stream=':a',
+                                             src_key='a',
+                                             dst_key='prev_a')
+        ],
+        read_messages_since=0,
+        redis_url=TEST_REDIS_URI)
+    resolver.register_consumer()
+    resolver.run_sync()
+
+    out_data = redis_sync.xread({resolver.output_stream_name: '0'})[0][1]
+    assert len(out_data) == 100
+    for i, (_, message) in enumerate(out_data):
+        assert message == {
+            MSG_ID_FIELD: f'Vehicle 1:{i}',
+            'prev_a': f'[{i - 1}]' if i else '[null]'
+        }
 
 
 def test_perf(test_input_perf, redis_sync):
@@ -238,7 +262,10 @@ def test_perf(test_input_perf, redis_sync):
     assert splitter.supported_impl == {
         ConsumerImpl.GEARS, ConsumerImpl.ASYNC, ConsumerImpl.SYNC
     }
-    sleep(4)
+    deadline = monotonic() + 4
+    while monotonic() < deadline and redis_sync.xlen(
+            resolver.output_stream_name) < len(test_input_perf):
+        sleep(0.05)
     for p in splitter_procs + resolver_procs:
         p.terminate()
 
@@ -252,3 +279,53 @@ def test_perf(test_input_perf, redis_sync):
         redis_sync.xlen(':test_perf:split'),
         redis_sync.xlen(resolver.output_stream_name)
     ])
+
+
+def splitters_for_config() -> List[Splitter]:
+    return [
+        cls(consumer_group_name=f'{name}-splitter',
+            object_id_field='vehicle_id',
+            namespace=name,
+            read_chunk_length=100,
+            redis_url=TEST_REDIS_URI,
+            input_streams=['test_input'])
+        for name, cls in (('sync', SyncSplitter), ('async', AsyncSplitter))
+    ]
+
+
+def test_consumer_config_default_for():
+    sync_splitter, async_splitter = splitters_for_config()
+    assert ConsumerConfig.default_for(sync_splitter) == ConsumerConfig(
+        workers=DEFAULT_WORKERS)
+    assert ConsumerConfig.default_for(async_splitter) == ConsumerConfig(
+        workers=DEFAULT_ASYNC_WORKERS,
+        coroutines=ASYNC_MESSAGES_IN_FLIGHT // 100)
+    slow_splitter = AsyncSplitter(consumer_group_name='slow-splitter',
+                                  object_id_field='vehicle_id',
+                                  namespace='slow',
+                                  read_chunk_length=ASYNC_MESSAGES_IN_FLIGHT * 2,
+                                  redis_url=TEST_REDIS_URI,
+                                  input_streams=['test_input'])
+    assert ConsumerConfig.default_for(slow_splitter).coroutines == 1
+
+
+def test_consumer_cli_args():
+    parser = argparse.ArgumentParser()
+    workers_config = add_consumer_args(parser, splitters_for_config())
+    assert workers_config == {
+        'sync-splitter': ConsumerConfig(workers=DEFAULT_WORKERS),
+        'async-splitter': ConsumerConfig(workers=DEFAULT_ASYNC_WORKERS,
+                                         coroutines=ASYNC_MESSAGES_IN_FLIGHT // 100)
+    }
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--sync-splitter-coroutines', '2'])
+
+    args = parser.parse_args([
+        '--sync-splitter-workers', '3', '--async-splitter-workers', '5',
+        '--async-splitter-coroutines', '7'
+    ])
+    update_workers_config(args, workers_config)
+    assert workers_config == {
+        'sync-splitter': ConsumerConfig(workers=3),
+        'async-splitter': ConsumerConfig(workers=5, coroutines=7)
+    }